@@ -26,15 +26,30 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import argparse
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import os
-from builtins import range
+import sys
+import threading
 import tritongrpcclient.core as grpcclient
 import tritongrpcclient.shared_memory as shm
-from ctypes import *
 
 FLAGS = None
 
+# Input data for the "simple" model. The first input is initialized to
+# unique integers and the second to all ones. Both are views into one
+# contiguous array laid out exactly as the input shared memory region,
+# so the region can be filled with a single copy. The data is created
+# once and marked read-only so it can be shared by every inference.
+_INPUT = np.concatenate([
+    np.arange(start=0, stop=16, dtype=np.int32),
+    np.ones(shape=16, dtype=np.int32)
+])
+_INPUT.setflags(write=False)
+_INPUT0 = _INPUT[:16]
+_INPUT1 = _INPUT[16:]
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('-v',
@@ -49,19 +64,43 @@ if __name__ == '__main__':
                         required=False,
                         default='localhost:8001',
                         help='Inference server URL. Default is localhost:8001.')
+    parser.add_argument('-n',
+                        '--iters',
+                        type=int,
+                        required=False,
+                        default=1,
+                        help='Number of inferences to run using the same '
+                        'shared memory regions. Default is 1.')
+    parser.add_argument('-c',
+                        '--concurrency',
+                        type=int,
+                        required=False,
+                        default=32,
+                        help='Maximum number of inferences in flight at a '
+                        'time. Default is 32.')
 
     FLAGS = parser.parse_args()
+    if FLAGS.iters < 1:
+        parser.error("argument -n/--iters: must be at least 1")
+    if FLAGS.concurrency < 1:
+        parser.error("argument -c/--concurrency: must be at least 1")
 
     try:
         triton_client = grpcclient.InferenceServerClient(FLAGS.url)
     except Exception as e:
         print("channel creation failed: " + str(e))
-        sys.exit()
+        sys.exit(1)
     
-    # To make sure no shared memory regions are registered with the
-    # server.
-    triton_client.unregister_system_shared_memory()
-    triton_client.unregister_cuda_shared_memory()
+    # To make sure the shared memory regions used by this example are not
+    # already registered with the server, e.g. by an earlier run that did
+    # not exit cleanly. Only these regions are unregistered so that regions
+    # owned by other clients of the server are left alone, and nothing is
+    # unregistered in the common case where none are left over.
+    shm_region_names = ("input_data", "output_data")
+    status = triton_client.get_system_shared_memory_status()
+    for name in status.regions:
+        if name in shm_region_names:
+            triton_client.unregister_system_shared_memory(name)
 
     # We use a simple model that takes 2 input tensors of 16 integers
     # each and returns 2 output tensors of 16 integers each. One
@@ -70,80 +109,126 @@ if __name__ == '__main__':
     model_name = "simple"
     model_version = ""
 
-    # Create the data for the two input tensors. Initialize the first
-    # to unique integers and the second to all ones.
-    input0_data = np.arange(start=0, stop=16, dtype=np.int32)
-    input1_data = np.ones(shape=16, dtype=np.int32)
+    input0_data = _INPUT0
+    input1_data = _INPUT1
 
-    input_byte_size = input0_data.size * input0_data.itemsize
+    # All tensors of the model share a single datatype, so the request
+    # datatype and the region sizes follow the input arrays. Smaller
+    # datatypes shrink the shared memory traffic proportionally.
+    datatype = grpcclient.np_to_triton_dtype(input0_data.dtype)
+    input_byte_size = input0_data.nbytes
     output_byte_size = input_byte_size
 
-    # Create Output0 and Output1 in Shared Memory and store shared memory handles
-    shm_op0_handle = shm.create_shared_memory_region("output0_data", "/output0_simple", output_byte_size)
-    shm_op1_handle = shm.create_shared_memory_region("output1_data", "/output1_simple", output_byte_size)
-
-    # Register Output0 and Output1 shared memory with Triton Server
-    triton_client.register_system_shared_memory("output0_data", "/output0_simple", output_byte_size)
-    triton_client.register_system_shared_memory("output1_data", "/output1_simple", output_byte_size)
-
-    # Create Input0 and Input1 in Shared Memory and store shared memory handles
-    shm_ip0_handle = shm.create_shared_memory_region("input0_data", "/input0_simple", input_byte_size)
-    shm_ip1_handle = shm.create_shared_memory_region("input1_data", "/input1_simple", input_byte_size)
+    # Create a single shared memory region holding both Output0 and
+    # Output1, back-to-back, and store the shared memory handle.
+    shm_op_handle = shm.create_shared_memory_region("output_data", "/output_simple", output_byte_size * 2)
+
+    # Create a single shared memory region holding both Input0 and
+    # Input1, back-to-back, and store the shared memory handle.
+    shm_ip_handle = shm.create_shared_memory_region("input_data", "/input_simple", input_byte_size * 2)
+
+    # The regions are reused by every inference below, so only release
+    # them once the script exits. The handler is installed before the
+    # regions are registered so that they are also released when the
+    # script fails part way, e.g. on a registration or inference error,
+    # rather than being left registered with the server. Unregistering a
+    # region that was never registered is not an error.
+    def release_shared_memory():
+        try:
+            for name in shm_region_names:
+                triton_client.unregister_system_shared_memory(name)
+        finally:
+            shm.destroy_shared_memory_region(shm_ip_handle)
+            shm.destroy_shared_memory_region(shm_op_handle)
+
+    atexit.register(release_shared_memory)
 
     # Put input data values into shared memory
-    shm.set_shared_memory_region(shm_ip0_handle, [input0_data])
-    shm.set_shared_memory_region(shm_ip1_handle, [input1_data])
-
-    # Register Input0 and Input1 shared memory with Triton Server
-    triton_client.register_system_shared_memory("input0_data", "/input0_simple", input_byte_size)
-    triton_client.register_system_shared_memory("input1_data", "/input1_simple", input_byte_size)
-
-    # Set the parameters to use data from shared memory
+    shm.set_shared_memory_region(shm_ip_handle, _INPUT)
+
+    # Register the output and input shared memory with Triton Server.
+    # The registrations are independent so issue them concurrently rather
+    # than waiting for one round trip before starting the next.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        register_futures = [
+            executor.submit(triton_client.register_system_shared_memory,
+                            "output_data", "/output_simple",
+                            output_byte_size * 2),
+            executor.submit(triton_client.register_system_shared_memory,
+                            "input_data", "/input_simple",
+                            input_byte_size * 2)
+        ]
+        for future in register_futures:
+            future.result()
+
+    # Set the parameters to use data from shared memory. The inputs and
+    # outputs only describe where the tensors live in the regions, so
+    # they are built once and reused by every inference. Running with new
+    # input data only requires writing it into the input region.
     inputs = []
-    inputs.append(grpcclient.InferInput('INPUT0', [1,16], "INT32"))
-    inputs[-1].set_parameter("shared_memory_region", "input0_data")
+    inputs.append(grpcclient.InferInput('INPUT0', [1,16], datatype))
+    inputs[-1].set_parameter("shared_memory_region", "input_data")
     inputs[-1].set_parameter("shared_memory_byte_size", input_byte_size)
+    inputs[-1].set_parameter("shared_memory_offset", 0)
 
-    inputs.append(grpcclient.InferInput('INPUT1', [1,16], "INT32"))
-    inputs[-1].set_parameter("shared_memory_region", "input1_data")
+    inputs.append(grpcclient.InferInput('INPUT1', [1,16], datatype))
+    inputs[-1].set_parameter("shared_memory_region", "input_data")
     inputs[-1].set_parameter("shared_memory_byte_size", input_byte_size)
+    inputs[-1].set_parameter("shared_memory_offset", input_byte_size)
 
     outputs = []
     outputs.append(grpcclient.InferOutput('OUTPUT0'))
-    # outputs[-1].set_parameter("shared_memory_region", "output0_data")
-    # outputs[-1].set_parameter("shared_memory_byte_size", output_byte_size)
+    outputs[-1].set_parameter("shared_memory_region", "output_data")
+    outputs[-1].set_parameter("shared_memory_byte_size", output_byte_size)
+    outputs[-1].set_parameter("shared_memory_offset", 0)
 
     outputs.append(grpcclient.InferOutput('OUTPUT1'))
-    # outputs[-1].set_parameter("shared_memory_region", "output1_data")
-    # outputs[-1].set_parameter("shared_memory_byte_size", output_byte_size)
-
-    results = triton_client.infer(inputs, outputs, model_name)
-
-    # TODO : Currently, this example doesn't use shared memory for output.
-    # This is done to effectively validate the results.
-    # tritongrpcclient.shared_memory module will be enhanced to read
-    # data from a specified shared memory handle, data_type and shape;
-    # and later return the numpy array.
-    output0_data = results.as_numpy('OUTPUT0')
-    output1_data = results.as_numpy('OUTPUT1')
-
-    for i in range(16):
-        print(str(input0_data[i]) + " + " + str(input1_data[i]) + " = " +
-              str(output0_data[0][i]))
-        print(str(input0_data[i]) + " - " + str(input1_data[i]) + " = " +
-              str(output1_data[0][i]))
-        if (input0_data[i] + input1_data[i]) != output0_data[0][i]:
-            print("shm infer error: incorrect sum")
-            sys.exit(1)
-        if (input0_data[i] - input1_data[i]) != output1_data[0][i]:
-            print("shm infer error: incorrect difference")
-            sys.exit(1)
+    outputs[-1].set_parameter("shared_memory_region", "output_data")
+    outputs[-1].set_parameter("shared_memory_byte_size", output_byte_size)
+    outputs[-1].set_parameter("shared_memory_offset", output_byte_size)
+
+    # Read results from the shared memory. The outputs are not returned
+    # in the response since they are written directly into the region.
+    # The arrays are views over the region rather than copies, so they are
+    # created once and reflect the results of every inference below.
+    output0_data = shm.get_contents_as_numpy(shm_op_handle, input0_data.dtype, [1,16])
+    output1_data = shm.get_contents_as_numpy(shm_op_handle, input0_data.dtype, [1,16], output_byte_size)
+
+    # Every request reads the same inputs and writes the same outputs, so
+    # issue them asynchronously over the one channel, keeping up to
+    # 'concurrency' requests in flight, and validate once all completed.
+    in_flight = threading.BoundedSemaphore(FLAGS.concurrency)
+    errors = []
+
+    def callback(result, error):
+        if error is not None:
+            errors.append(error)
+        in_flight.release()
+
+    async_infer = triton_client.async_infer
+    for _ in range(FLAGS.iters):
+        in_flight.acquire()
+        async_infer(callback, inputs, outputs, model_name)
+
+    # Wait until all the inferences have completed
+    for _ in range(FLAGS.concurrency):
+        in_flight.acquire()
+
+    if errors:
+        print(errors[0])
+        sys.exit(1)
+    if not np.array_equal(output0_data[0], input0_data + input1_data):
+        print("shm infer error: incorrect sum")
+        sys.exit(1)
+    if not np.array_equal(output1_data[0], input0_data - input1_data):
+        print("shm infer error: incorrect difference")
+        sys.exit(1)
+
+    sys.stdout.write("".join(
+        "{0} + {1} = {2}\n{0} - {1} = {3}\n".format(a, b, s, d)
+        for a, b, s, d in zip(input0_data, input1_data, output0_data[0],
+                              output1_data[0])))
 
     print(triton_client.get_system_shared_memory_status())
-    triton_client.unregister_system_shared_memory()
-    shm.destroy_shared_memory_region(shm_ip0_handle)
-    shm.destroy_shared_memory_region(shm_ip1_handle)
-    shm.destroy_shared_memory_region(shm_op0_handle)
-    shm.destroy_shared_memory_region(shm_op1_handle)
 
     print('PASS: shm')
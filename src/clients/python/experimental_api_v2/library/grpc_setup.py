@@ -33,9 +33,7 @@ if 'VERSION' not in os.environ:
 
 VERSION = os.environ['VERSION']
 
-REQUIRED = [
-    'numpy', 'python-rapidjson', 'protobuf>=3.5.0', 'grpcio'
-]
+REQUIRED = ['numpy', 'protobuf>=3.5.0', 'grpcio']
 
 try:
     from wheel.bdist_wheel import bdist_wheel as _bdist_wheel
@@ -27,13 +27,130 @@
 import base64
 import numpy as np
 import grpc
-import rapidjson as json
-from google.protobuf.json_format import MessageToJson
+import itertools
+import logging
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from google.protobuf.internal import api_implementation
+from google.protobuf.json_format import MessageToDict
 
 from tritongrpcclient import grpc_service_v2_pb2
 from tritongrpcclient import grpc_service_v2_pb2_grpc
 from tritongrpcclient.utils import *
 
+_logger = logging.getLogger(__name__)
+
+# Every inference builds and serializes a ModelInferRequest and parses
+# the response, which is one to two orders of magnitude slower with the
+# pure-Python protobuf implementation than with the C++ (or upb) one.
+if api_implementation.Type() == 'python':
+    warnings.warn(
+        "protobuf is using the pure-Python implementation, install a "
+        "protobuf package with the C++ or upb backend for better "
+        "client performance")
+
+# The size of a cudaIpcMemHandle_t. Its base64 encoding is always longer,
+# which lets register_cuda_shared_memory tell the two apart.
+_CUDA_IPC_HANDLE_SIZE = 64
+
+_InferInputTensor = grpc_service_v2_pb2.ModelInferRequest.InferInputTensor
+_InferRequestedOutputTensor = (
+    grpc_service_v2_pb2.ModelInferRequest.InferRequestedOutputTensor)
+
+# The numpy dtype of each fixed-size datatype, resolved once so that
+# decoding an output does not repeat the conversion.
+_DTYPE_DECODE = {
+    datatype: np.dtype(triton_to_np_dtype(datatype))
+    for datatype in ('BOOL', 'INT8', 'INT16', 'INT32', 'INT64', 'UINT8',
+                     'UINT16', 'UINT32', 'UINT64', 'FP16', 'FP32', 'FP64')
+}
+
+# The InferParameter field that holds a parameter value of each supported
+# type. Matched on the exact type, so bool values are not taken as int.
+_PARAM_FIELD = {int: 'int64_param', bool: 'bool_param', str: 'string_param'}
+
+
+def _encode_varint(value):
+    """Encodes a non-negative integer as a protobuf base 128 varint."""
+    encoded = bytearray()
+    while value > 0x7f:
+        encoded.append((value & 0x7f) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _length_delimited_tag(message_descriptor, field_name):
+    """Returns the wire tag of a length-delimited field of a message."""
+    field_number = message_descriptor.fields_by_name[field_name].number
+    return _encode_varint(field_number << 3 | 2)
+
+
+_INPUTS_TAG = _length_delimited_tag(
+    grpc_service_v2_pb2.ModelInferRequest.DESCRIPTOR, 'inputs')
+_CONTENTS_TAG = _length_delimited_tag(_InferInputTensor.DESCRIPTOR,
+                                      'contents')
+_RAW_CONTENTS_TAG = _length_delimited_tag(
+    grpc_service_v2_pb2.InferTensorContents.DESCRIPTOR, 'raw_contents')
+
+
+def _serialize_infer_request(infer_request):
+    """Serializes a ModelInferRequest, splicing the raw contents of each
+    input tensor into the wire format directly from the InferInput
+    rather than copying them into the message first.
+
+    Parameters
+    ----------
+    infer_request : tuple
+        The ModelInferRequest holding everything but the inputs, and the
+        list of InferInput objects, as returned by
+        InferenceServerClient._get_inference_request().
+
+    Returns
+    -------
+    bytes
+        The serialized ModelInferRequest.
+
+    """
+    request, inputs = infer_request
+    parts = [request.SerializeToString()]
+    for infer_input in inputs:
+        tensor = infer_input._get_tensor().SerializeToString()
+        raw_content = infer_input._get_content()
+        if raw_content is None:
+            parts += [_INPUTS_TAG, _encode_varint(len(tensor)), tensor]
+            continue
+        # A second occurrence of the singular 'contents' field is merged
+        # into the tensor by the parser, so it can simply be appended.
+        contents_header = _RAW_CONTENTS_TAG + _encode_varint(len(raw_content))
+        contents_size = len(contents_header) + len(raw_content)
+        tensor_suffix = (_CONTENTS_TAG + _encode_varint(contents_size) +
+                         contents_header)
+        parts += [
+            _INPUTS_TAG,
+            _encode_varint(len(tensor) + len(tensor_suffix) +
+                           len(raw_content)), tensor, tensor_suffix,
+            raw_content
+        ]
+    return b''.join(parts)
+
+
+class _InferenceServiceStub(grpc_service_v2_pb2_grpc.GRPCInferenceServiceStub):
+    """A GRPCInferenceServiceStub whose ModelInfer takes the request in
+    the form returned by InferenceServerClient._get_inference_request()
+    and serializes it with _serialize_infer_request().
+
+    """
+
+    def __init__(self, channel):
+        super().__init__(channel)
+        self.ModelInfer = channel.unary_unary(
+            '/' + grpc_service_v2_pb2.DESCRIPTOR.
+            services_by_name['GRPCInferenceService'].full_name + '/ModelInfer',
+            request_serializer=_serialize_infer_request,
+            response_deserializer=grpc_service_v2_pb2.ModelInferResponse.
+            FromString)
+
 
 def get_error_grpc(rpc_error):
     return InferenceServerException(
@@ -57,6 +174,20 @@ class InferenceServerClient:
 
     verbose : bool
         If True generate verbose output. Default value is False.
+
+    channel_count : int
+        The number of gRPC channels, each with its own HTTP/2
+        connection, to create for this client. Requests are distributed
+        across the channels in round-robin order, which avoids the
+        per-connection stream and flow-control limits when many
+        requests are in flight concurrently. Default value is 1.
+
+    callback_worker_count : int
+        The number of worker threads that run the callbacks of
+        async_infer. Callbacks are run off the gRPC completion thread so
+        that slow callbacks do not delay the completion of other
+        requests. Default value is 1, which runs the callbacks one at a
+        time in completion order.
     
     Raises
     ------
@@ -65,12 +196,45 @@ class InferenceServerClient:
 
     """
 
-    def __init__(self, url, verbose=False):
+    def __init__(self,
+                 url,
+                 verbose=False,
+                 channel_count=1,
+                 callback_worker_count=1):
+        # Set before validating, so that close() from __del__ works on a
+        # client whose construction failed.
+        self._channels = []
+        self._callback_pool = None
+        if channel_count < 1:
+            raise_error("channel_count must be at least 1")
+        if callback_worker_count < 1:
+            raise_error("callback_worker_count must be at least 1")
         # FixMe: Are any of the channel options worth exposing?
         # https://grpc.io/grpc/core/group__grpc__arg__keys.html
-        self._channel = grpc.insecure_channel(url, options=None)
-        self._client_stub = grpc_service_v2_pb2_grpc.GRPCInferenceServiceStub(
-            self._channel)
+        # Tensors routinely exceed the default 4MB message limit, so
+        # lift the limit in both directions.
+        options = [('grpc.max_send_message_length', -1),
+                   ('grpc.max_receive_message_length', -1)]
+        # Channels created with identical arguments share subchannels,
+        # and so a single connection, unless each uses a local pool.
+        if channel_count > 1:
+            options.append(('grpc.use_local_subchannel_pool', 1))
+        self._channels = [
+            grpc.insecure_channel(url, options=options)
+            for _ in range(channel_count)
+        ]
+        self._client_stubs = [
+            _InferenceServiceStub(channel) for channel in self._channels
+        ]
+        # Returns the stub to issue the next request with, cycling
+        # through the stubs of all the channels. Bound once here so each
+        # RPC pays a single builtin call to pick its stub.
+        self._next_client_stub = itertools.cycle(self._client_stubs).__next__
+        self._callback_pool = ThreadPoolExecutor(
+            max_workers=callback_worker_count)
+        # Keeps the in-flight async_infer calls referenced until they
+        # complete.
+        self._call_futures = set()
         self._verbose = verbose
 
     def __enter__(self):
@@ -87,7 +251,10 @@ class InferenceServerClient:
         will result in an Error.
 
         """
-        self._channel.close()
+        for channel in self._channels:
+            channel.close()
+        if self._callback_pool is not None:
+            self._callback_pool.shutdown(wait=False)
 
     def is_server_live(self):
         """Contact the inference server and get liveness.
@@ -105,7 +272,7 @@ class InferenceServerClient:
         """
         try:
             request = grpc_service_v2_pb2.ServerLiveRequest()
-            response = self._client_stub.ServerLive(request)
+            response = self._next_client_stub().ServerLive(request)
             return response.live
         except grpc.RpcError as rpc_error:
             raise_error_grpc(rpc_error)
@@ -126,7 +293,7 @@ class InferenceServerClient:
         """
         try:
             request = grpc_service_v2_pb2.ServerReadyRequest()
-            response = self._client_stub.ServerReady(request)
+            response = self._next_client_stub().ServerReady(request)
             return response.ready
         except grpc.RpcError as rpc_error:
             raise_error_grpc(rpc_error)
@@ -158,7 +325,7 @@ class InferenceServerClient:
         try:
             request = grpc_service_v2_pb2.ModelReadyRequest(
                 name=model_name, version=model_version)
-            response = self._client_stub.ModelReady(request)
+            response = self._next_client_stub().ModelReady(request)
             return response.ready
         except grpc.RpcError as rpc_error:
             raise_error_grpc(rpc_error)
@@ -186,9 +353,9 @@ class InferenceServerClient:
         """
         try:
             request = grpc_service_v2_pb2.ServerMetadataRequest()
-            response = self._client_stub.ServerMetadata(request)
+            response = self._next_client_stub().ServerMetadata(request)
             if as_json:
-                return json.loads(MessageToJson(response))
+                return MessageToDict(response)
             else:
                 return response
         except grpc.RpcError as rpc_error:
@@ -224,9 +391,9 @@ class InferenceServerClient:
         try:
             request = grpc_service_v2_pb2.ModelMetadataRequest(
                 name=model_name, version=model_version)
-            response = self._client_stub.ModelMetadata(request)
+            response = self._next_client_stub().ModelMetadata(request)
             if as_json:
-                return json.loads(MessageToJson(response))
+                return MessageToDict(response)
             else:
                 return response
         except grpc.RpcError as rpc_error:
@@ -262,9 +429,9 @@ class InferenceServerClient:
         try:
             request = grpc_service_v2_pb2.ModelConfigRequest(
                 name=model_name, version=model_version)
-            response = self._client_stub.ModelConfig(request)
+            response = self._next_client_stub().ModelConfig(request)
             if as_json:
-                return json.loads(MessageToJson(response))
+                return MessageToDict(response)
             else:
                 return response
         except grpc.RpcError as rpc_error:
@@ -289,9 +456,9 @@ class InferenceServerClient:
         """
         try:
             request = grpc_service_v2_pb2.RepositoryIndexRequest()
-            response = self._client_stub.RepositoryIndex(request)
+            response = self._next_client_stub().RepositoryIndex(request)
             if as_json:
-                return json.loads(MessageToJson(response))
+                return MessageToDict(response)
             else:
                 return response
         except grpc.RpcError as rpc_error:
@@ -314,7 +481,7 @@ class InferenceServerClient:
         try:
             request = grpc_service_v2_pb2.RepositoryModelLoadRequest(
                 model_name=model_name)
-            self._client_stub.RepositoryModelLoad(request)
+            self._next_client_stub().RepositoryModelLoad(request)
         except grpc.RpcError as rpc_error:
             raise_error_grpc(rpc_error)
 
@@ -335,7 +502,7 @@ class InferenceServerClient:
         try:
             request = grpc_service_v2_pb2.RepositoryModelUnloadRequest(
                 model_name=model_name)
-            self._client_stub.RepositoryModelUnload(request)
+            self._next_client_stub().RepositoryModelUnload(request)
         except grpc.RpcError as rpc_error:
             raise_error_grpc(rpc_error)
 
@@ -369,9 +536,10 @@ class InferenceServerClient:
         try:
             request = grpc_service_v2_pb2.SystemSharedMemoryStatusRequest(
                 name=region_name)
-            response = self._client_stub.SystemSharedMemoryStatus(request)
+            response = self._next_client_stub().SystemSharedMemoryStatus(
+                request)
             if as_json:
-                return json.loads(MessageToJson(response))
+                return MessageToDict(response)
             else:
                 return response
         except grpc.RpcError as rpc_error:
@@ -404,7 +572,7 @@ class InferenceServerClient:
         try:
             request = grpc_service_v2_pb2.SystemSharedMemoryRegisterRequest(
                 name=name, key=key, offset=offset, byte_size=byte_size)
-            self._client_stub.SystemSharedMemoryRegister(request)
+            self._next_client_stub().SystemSharedMemoryRegister(request)
         except grpc.RpcError as rpc_error:
             raise_error_grpc(rpc_error)
 
@@ -428,7 +596,7 @@ class InferenceServerClient:
         try:
             request = grpc_service_v2_pb2.SystemSharedMemoryUnregisterRequest(
                 name=name)
-            self._client_stub.SystemSharedMemoryUnregister(request)
+            self._next_client_stub().SystemSharedMemoryUnregister(request)
         except grpc.RpcError as rpc_error:
             raise_error_grpc(rpc_error)
 
@@ -462,9 +630,9 @@ class InferenceServerClient:
         try:
             request = grpc_service_v2_pb2.CudaSharedMemoryStatusRequest(
                 name=region_name)
-            response = self._client_stub.CudaSharedMemoryStatus(request)
+            response = self._next_client_stub().CudaSharedMemoryStatus(request)
             if as_json:
-                return json.loads(MessageToJson(response))
+                return MessageToDict(response)
             else:
                 return response
         except grpc.RpcError as rpc_error:
@@ -480,7 +648,10 @@ class InferenceServerClient:
         name : str
             The name of the region to register.
         raw_handle : bytes 
-            The raw serialized cudaIPC handle in base64 encoding.
+            The raw serialized cudaIPC handle in base64 encoding, as
+            returned by cuda_shared_memory.get_raw_handle(). The
+            undecoded 64-byte cudaIPC handle is also accepted as
+            bytes or bytearray, in which case it is sent as is.
         device_id : int
             The GPU device ID on which the cudaIPC handle was created.
         byte_size : int
@@ -492,13 +663,16 @@ class InferenceServerClient:
             If unable to register the specified cuda shared memory.     
 
         """
+        if not (isinstance(raw_handle, (bytes, bytearray)) and
+                len(raw_handle) == _CUDA_IPC_HANDLE_SIZE):
+            raw_handle = base64.b64decode(raw_handle)
         try:
             request = grpc_service_v2_pb2.CudaSharedMemoryRegisterRequest(
                 name=name,
-                raw_handle=base64.b64decode(raw_handle),
+                raw_handle=bytes(raw_handle),
                 device_id=device_id,
                 byte_size=byte_size)
-            self._client_stub.CudaSharedMemoryRegister(request)
+            self._next_client_stub().CudaSharedMemoryRegister(request)
         except grpc.RpcError as rpc_error:
             raise_error_grpc(rpc_error)
 
@@ -522,7 +696,7 @@ class InferenceServerClient:
         try:
             request = grpc_service_v2_pb2.CudaSharedMemoryUnregisterRequest(
                 name=name)
-            self._client_stub.CudaSharedMemoryUnregister(request)
+            self._next_client_stub().CudaSharedMemoryUnregister(request)
         except grpc.RpcError as rpc_error:
             raise_error_grpc(rpc_error)
 
@@ -532,7 +706,8 @@ class InferenceServerClient:
               model_name,
               model_version="",
               request_id=None,
-              parameters=None):
+              parameters=None,
+              compression=None):
         """Run synchronous inference using the supplied 'inputs' requesting
         the outputs specified by 'outputs'.
 
@@ -557,6 +732,10 @@ class InferenceServerClient:
             will be used.
         parameters: dict
             Optional inference parameters described as key-value pairs.
+        compression: grpc.Compression
+            Optional compression algorithm to apply to the request, e.g.
+            grpc.Compression.Gzip. Default value is 'None' which means the
+            request is sent uncompressed.
 
         Returns
         -------
@@ -575,7 +754,8 @@ class InferenceServerClient:
                                               parameters)
 
         try:
-            response = self._client_stub.ModelInfer(request)
+            response = self._next_client_stub().ModelInfer(
+                request, compression=compression)
             result = InferResult(response)
             return result
         except grpc.RpcError as rpc_error:
@@ -588,7 +768,8 @@ class InferenceServerClient:
                     model_name,
                     model_version="",
                     request_id=None,
-                    parameters=None):
+                    parameters=None,
+                    compression=None):
         """Run asynchronous inference using the supplied 'inputs' requesting
         the outputs specified by 'outputs'.
 
@@ -601,6 +782,7 @@ class InferenceServerClient:
             respectively which will be provided to the function when executing
             the callback. The ownership of these objects will be given to the
             user. The 'error' would be None for a successful inference.
+            An exception raised by the function is logged and discarded.
         inputs : list
             A list of InferInput objects, each describing data for a input
             tensor required by the model.
@@ -620,6 +802,10 @@ class InferenceServerClient:
             will be used.
         parameters: dict
             Optional inference parameters described as key-value pairs.
+        compression: grpc.Compression
+            Optional compression algorithm to apply to the request, e.g.
+            grpc.Compression.Gzip. Default value is 'None' which means the
+            request is sent uncompressed.
     
         Raises
         ------
@@ -627,21 +813,38 @@ class InferenceServerClient:
             If server fails to issue inference.
         """
 
-        def wrapped_callback(call_future):
+        def run_callback(call_future):
             error = result = None
             try:
                 result = InferResult(call_future.result())
             except grpc.RpcError as rpc_error:
                 error = get_error_grpc(rpc_error)
-            callback(result=result, error=error)
+            # The callback runs on a worker thread whose Future is not
+            # kept, so an exception raised by it would go unnoticed.
+            try:
+                callback(result=result, error=error)
+            except Exception:
+                _logger.exception("Exception raised by the async_infer "
+                                  "callback")
+
+        def wrapped_callback(call_future):
+            self._call_futures.discard(call_future)
+            try:
+                self._callback_pool.submit(run_callback, call_future)
+            except RuntimeError:
+                # The client has been closed, deliver the (cancellation)
+                # result on the completion thread instead.
+                run_callback(call_future)
 
         request = self._get_inference_request(inputs, outputs, model_name,
                                               model_version, request_id,
                                               parameters)
 
         try:
-            self._call_future = self._client_stub.ModelInfer.future(request)
-            self._call_future.add_done_callback(wrapped_callback)
+            call_future = self._next_client_stub().ModelInfer.future(
+                request, compression=compression)
+            self._call_futures.add(call_future)
+            call_future.add_done_callback(wrapped_callback)
         except grpc.RpcError as rpc_error:
             raise_error_grpc(rpc_error)
 
@@ -673,8 +876,11 @@ class InferenceServerClient:
 
         Returns
         -------
-        ModelInferRequest
-            The protobuf message holding the inference request.
+        tuple
+            The ModelInferRequest protobuf message holding everything but
+            the inputs, and the list of InferInput objects. The inputs are
+            added when the request is serialized, see
+            _serialize_infer_request().
         
         Raises
         ------
@@ -688,17 +894,13 @@ class InferenceServerClient:
         request.model_version = model_version
         if request_id != None:
             request.id = request_id
-        for infer_input in inputs:
-            request.inputs.extend([infer_input._get_tensor()])
-        for infer_output in outputs:
-            request.outputs.extend([infer_output._get_tensor()])
+        request.outputs.extend(
+            [infer_output._get_tensor() for infer_output in outputs])
         if parameters:
-            for param_key in parameters:
-                _set_parameter(request,
-                               key=param_key,
-                               value=parameters[param_key])
+            for param_key, param_value in parameters.items():
+                self._set_parameter(request, key=param_key, value=param_value)
 
-        return request
+        return request, inputs
 
     def _set_parameter(self, request, key, value):
         """Adds the specified key-value pair to the request
@@ -718,19 +920,14 @@ class InferenceServerClient:
             If server fails to add the parameter to request.
 
         """
-        if not type(key) is str:
+        if not isinstance(key, str):
             raise_error(
                 "only string data type for key is supported in parameters")
 
-        param = request.parameters[key]
-        if type(value) is int:
-            param.int64_param = value
-        elif type(value) is bool:
-            param.bool_param = value
-        elif type(value) is str:
-            param.string_param = value
-        else:
+        field = _PARAM_FIELD.get(type(value))
+        if field is None:
             raise_error("unsupported value type for the parameter")
+        setattr(request.parameters[key], field, value)
 
 
 class InferInput:
@@ -749,13 +946,12 @@ class InferInput:
     """
 
     def __init__(self, name, shape=None, datatype=None):
-        self._input = grpc_service_v2_pb2.ModelInferRequest().InferInputTensor()
-        self._input.name = name
+        self._input = _InferInputTensor(name=name)
         if shape:
-            self._input.ClearField('shape')
-            self._input.shape.extend(shape)
+            self._input.shape[:] = shape
         if datatype:
             self._input.datatype = datatype
+        self._raw_content = None
 
     def name(self):
         """Get the name of input associated with this object.
@@ -798,14 +994,19 @@ class InferInput:
         """
         if not isinstance(input_tensor, (np.ndarray,)):
             raise_error("input_tensor must be a numpy array")
-        self._input.datatype = np_to_triton_dtype(input_tensor.dtype)
-        self._input.ClearField('shape')
-        self._input.shape.extend(input_tensor.shape)
-        if self._input.datatype == "BYTES":
-            self._input.contents.raw_contents = serialize_byte_tensor(
-                input_tensor).tobytes()
+        _input = self._input
+        datatype = np_to_triton_dtype(input_tensor.dtype)
+        if datatype is None:
+            raise_error("unsupported numpy datatype " + str(input_tensor.dtype))
+        _input.datatype = datatype
+        _input.shape[:] = input_tensor.shape
+        # The raw contents are kept out of the message and spliced in when
+        # the request is serialized, which saves copying them into the
+        # message and then out of it again.
+        if datatype == "BYTES":
+            self._raw_content = serialize_byte_tensor(input_tensor)
         else:
-            self._input.contents.raw_contents = input_tensor.tobytes()
+            self._raw_content = input_tensor.tobytes()
 
     def set_parameter(self, key, value):
         """Adds the specified key-value pair in the requested input parameters
@@ -818,19 +1019,14 @@ class InferInput:
             The value of the parameter
         
         """
-        if not type(key) is str:
+        if not isinstance(key, str):
             raise_error(
                 "only string data type for key is supported in parameters")
 
-        param = self._input.parameters[key]
-        if type(value) is int:
-            param.int64_param = value
-        elif type(value) is bool:
-            param.bool_param = value
-        elif type(value) is str:
-            param.string_param = value
-        else:
+        field = _PARAM_FIELD.get(type(value))
+        if field is None:
             raise_error("unsupported value type for the parameter")
+        setattr(self._input.parameters[key], field, value)
 
     def clear_parameters(self):
         """Clears all the parameters that have been added to the input request.
@@ -847,6 +1043,17 @@ class InferInput:
         """
         return self._input
 
+    def _get_content(self):
+        """Retrieve the raw contents of the input tensor, which are not
+        part of the InferInputTensor message.
+
+        Returns
+        -------
+        bytes-like object
+            The serialized tensor data or None if no data is set.
+        """
+        return self._raw_content
+
 
 class InferOutput:
     """An object of InferOutput class is used to describe a
@@ -859,9 +1066,7 @@ class InferOutput:
     """
 
     def __init__(self, name):
-        self._output = grpc_service_v2_pb2.ModelInferRequest(
-        ).InferRequestedOutputTensor()
-        self._output.name = name
+        self._output = _InferRequestedOutputTensor(name=name)
 
     def name(self):
         """Get the name of output associated with this object.
@@ -884,19 +1089,14 @@ class InferOutput:
             The value of the parameter
         
         """
-        if not type(key) is str:
+        if not isinstance(key, str):
             raise_error(
                 "only string data type for key is supported in parameters")
 
-        param = self._output.parameters[key]
-        if type(value) is int:
-            param.int64_param = value
-        elif type(value) is bool:
-            param.bool_param = value
-        elif type(value) is str:
-            param.string_param = value
-        else:
+        field = _PARAM_FIELD.get(type(value))
+        if field is None:
             raise_error("unsupported value type for the parameter")
+        setattr(self._output.parameters[key], field, value)
 
     def clear_parameters(self):
         """Clears all the parameters that have been added to the output request.
@@ -927,8 +1127,12 @@ class InferResult:
 
     def __init__(self, result):
         self._result = result
+        # The output tensors by name, built on first use.
+        self._by_name = None
+        # The numpy arrays already decoded by as_numpy, by output name.
+        self._cache = {}
 
-    def as_numpy(self, name):
+    def as_numpy(self, name, out=None):
         """Get the tensor data for output associated with this object
         in numpy format
 
@@ -936,37 +1140,98 @@ class InferResult:
         ----------
         name : str
             The name of the output tensor whose result is to be retrieved.
+        out : numpy array
+            Optional preallocated array to copy the tensor data into. It
+            must have the shape and datatype of the output tensor. Default
+            value is None which means the data is not copied.
     
         Returns
         -------
         numpy array
             The numpy array containing the response data for the tensor or
-            None if the data for specified tensor name is not found.
-        """
-        for output in self._result.outputs:
-            if output.name == name:
-                shape = []
-                for value in output.shape:
-                    shape.append(value)
-
-                datatype = output.datatype
-                if len(output.contents.raw_contents) != 0:
-                    if datatype == 'BYTES':
-                        # String results contain a 4-byte string length
-                        # followed by the actual string characters. Hence,
-                        # need to decode the raw bytes to convert into
-                        # array elements.
-                        np_array = deserialize_bytes_tensor(
-                            output.contents.raw_contents)
-                    else:
-                        np_array = np.frombuffer(
-                            output.contents.raw_contents,
-                            dtype=triton_to_np_dtype(datatype))
-                elif len(output.contents.byte_contents) != 0:
-                    np_array = np.array(output.contents.byte_contents)
-                np_array = np.resize(np_array, shape)
-                return np_array
-        return None
+            None if the data for specified tensor name is not found. If
+            'out' is specified it is returned holding the data. Otherwise
+            the array is decoded once and the same read-only array is
+            returned by later calls, use np.copy() to obtain a writable
+            array.
+
+        Raises
+        ------
+        InferenceServerException
+            If 'out' does not match the shape and datatype of the tensor or
+            if the response holds no data for the tensor, e.g. because it
+            was placed in shared memory.
+        """
+        np_array = self._cache.get(name)
+        if np_array is None:
+            np_array = self._decode_output(name)
+            if np_array is None:
+                return None
+            self._cache[name] = np_array
+        if out is None:
+            return np_array
+        if out.shape != np_array.shape or out.dtype != np_array.dtype:
+            raise_error("out must have shape " + str(np_array.shape) +
+                        " and datatype " + str(np_array.dtype))
+        np.copyto(out, np_array)
+        return out
+
+    def _decode_output(self, name):
+        """Decode the data of the specified output tensor into a read-only
+        numpy array.
+
+        Parameters
+        ----------
+        name : str
+            The name of the output tensor to decode.
+
+        Returns
+        -------
+        numpy array
+            The decoded tensor or None if the response holds no output
+            with the specified name.
+
+        Raises
+        ------
+        InferenceServerException
+            If the output holds no data in the response.
+        """
+        if self._by_name is None:
+            self._by_name = {
+                output.name: output for output in self._result.outputs
+            }
+        output = self._by_name.get(name)
+        if output is None:
+            return None
+
+        shape = tuple(output.shape)
+        datatype = output.datatype
+        contents = output.contents
+        raw_contents = contents.raw_contents
+        if len(raw_contents) != 0:
+            if datatype == 'BYTES':
+                # String results contain a 4-byte string length
+                # followed by the actual string characters. Hence,
+                # need to decode the raw bytes to convert into
+                # array elements.
+                np_array = deserialize_bytes_tensor(raw_contents).reshape(
+                    shape)
+            else:
+                # Constructs the shaped array directly over the response
+                # bytes, which makes it a read-only view.
+                dtype = _DTYPE_DECODE.get(datatype)
+                if dtype is None:
+                    dtype = triton_to_np_dtype(datatype)
+                np_array = np.ndarray(shape, dtype=dtype, buffer=raw_contents)
+        elif len(contents.byte_contents) != 0:
+            np_array = np.array(contents.byte_contents).reshape(shape)
+        elif 0 in shape:
+            np_array = np.empty(shape, dtype=triton_to_np_dtype(datatype))
+        else:
+            raise_error("output '" + name + "' has no data in the response, "
+                        "e.g. because it was placed in shared memory")
+        np_array.flags.writeable = False
+        return np_array
 
     def get_statistics(self, as_json=False):
         """Retrieves the InferStatistics for this response as
@@ -984,11 +1249,11 @@ class InferResult:
             The InferStatistics protobuf message or dict for this response.
         """
         if as_json:
-            return json.loads(MessageToJson(self._result.statistics))
+            return MessageToDict(self._result.statistics)
         else:
             return self._result.statistics
 
-    def get_response(self, as_json=False):
+    def get_response(self, as_json=False, include_tensor_bytes=False):
         """Retrieves the complete ModelInferResponse as a
         json dict object or protobuf message
 
@@ -997,13 +1262,32 @@ class InferResult:
         as_json : bool
             If True then returns response as a json dict, otherwise
             as a protobuf message. Default value is False.
+        include_tensor_bytes : bool
+            If True then the json dict includes the contents of the
+            output tensors, base64 encoded. Default value is False which
+            means the contents are left out, use as_numpy() to retrieve
+            the tensor data. Ignored if 'as_json' is False.
     
         Returns
         -------
         protobuf message or dict
             The underlying ModelInferResponse as a protobuf message or dict.
         """
-        if as_json:
-            return json.loads(MessageToJson(self._result))
-        else:
+        if not as_json:
             return self._result
+        if include_tensor_bytes:
+            return MessageToDict(self._result)
+        # Rebuild the response from its metadata only, so that the tensor
+        # contents are neither copied nor encoded.
+        result = self._result
+        response = grpc_service_v2_pb2.ModelInferResponse(
+            model_version=result.model_version, id=result.id)
+        for key, value in result.parameters.items():
+            response.parameters[key].CopyFrom(value)
+        response.outputs.extend([
+            grpc_service_v2_pb2.ModelInferResponse.InferOutputTensor(
+                name=output.name,
+                datatype=output.datatype,
+                shape=output.shape) for output in result.outputs
+        ])
+        return MessageToDict(response)
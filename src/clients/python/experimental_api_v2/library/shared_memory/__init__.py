@@ -55,6 +55,9 @@ _cshm_shared_memory_region_create.argtypes = [_utf8, _utf8, c_uint64, POINTER(c_
 _cshm_shared_memory_region_set = _cshm.SharedMemoryRegionSet
 _cshm_shared_memory_region_set.restype = c_int
 _cshm_shared_memory_region_set.argtypes = [c_void_p, c_uint64, c_uint64, c_void_p]
+_cshm_get_shared_memory_handle_info = _cshm.GetSharedMemoryHandleInfo
+_cshm_get_shared_memory_handle_info.restype = c_int
+_cshm_get_shared_memory_handle_info.argtypes = [c_void_p, POINTER(c_void_p), POINTER(c_uint64)]
 _cshm_shared_memory_region_destroy = _cshm.SharedMemoryRegionDestroy
 _cshm_shared_memory_region_destroy.restype = c_int
 _cshm_shared_memory_region_destroy.argtypes = [c_void_p]
@@ -75,6 +78,14 @@ def _raise_error(msg):
 
 def create_shared_memory_region(triton_shm_name, shm_key, byte_size):
     """Creates a shared memory region with the specified name and size.
+    The backing space of the region is reserved up front, so a region
+    that does not fit (e.g. in a small /dev/shm) raises an exception
+    here rather than crashing the process on first access. The pages are
+    then mapped in ahead of first use and, on Linux, regions of 2MB or
+    more are advised to be backed by transparent huge pages, which only
+    takes effect if the /dev/shm mount allocates huge pages itself
+    (huge=within_size or huge=always). The region is a POSIX shared
+    memory object so that the server can open it by 'shm_key'.
 
     Parameters
     ----------
@@ -103,14 +114,16 @@ def create_shared_memory_region(triton_shm_name, shm_key, byte_size):
     return shm_handle
 
 def set_shared_memory_region(shm_handle, input_values):
-    """Copy the contents of the numpy array into a shared memory region.
+    """Copy the contents of the numpy array(s) into a shared memory region.
 
     Parameters
     ----------
     shm_handle : c_void_p
         The handle for the shared memory region.
-    input_values : np.array
-        The list of numpy arrays to be copied into the shared memory region.
+    input_values : np.array or list
+        The numpy array, or the list of numpy arrays, to be copied into
+        the shared memory region. Multiple arrays are copied back-to-back
+        starting at the beginning of the region.
 
     Raises
     ------
@@ -118,22 +131,86 @@ def set_shared_memory_region(shm_handle, input_values):
         If unable to mmap or set values in the shared memory region.
     """
 
-    if not isinstance(input_values, (list,tuple)):
-        _raise_error("input_values must be specified as a list/tuple of numpy arrays")
+    if isinstance(input_values, np.ndarray):
+        input_values = (input_values,)
+    elif not isinstance(input_values, (list,tuple)):
+        _raise_error("input_values must be specified as a numpy array or a list/tuple of numpy arrays")
     for input_value in input_values:
         if not isinstance(input_value, np.ndarray):
             _raise_error("each element of input_values must be a numpy array")
 
     offset_current = 0
     for input_value in input_values:
-        input_value = np.ascontiguousarray(input_value).flatten()
-        byte_size = input_value.size * input_value.itemsize
-        _raise_if_error(
-            c_int(_cshm_shared_memory_region_set(shm_handle, c_uint64(offset_current), \
-                c_uint64(byte_size), input_value.ctypes.data_as(c_void_p))))
+        if input_value.flags['C_CONTIGUOUS'] or input_value.dtype.hasobject:
+            # A single memcpy straight from the array buffer.
+            input_value = np.ascontiguousarray(input_value)
+            byte_size = input_value.nbytes
+            _raise_if_error(
+                c_int(_cshm_shared_memory_region_set(shm_handle, c_uint64(offset_current), \
+                    c_uint64(byte_size), input_value.ctypes.data_as(c_void_p))))
+        else:
+            # Non-contiguous arrays, e.g. strided slices or stride-0
+            # broadcasts of a scalar, are written straight into the region
+            # instead of first being made contiguous in a temporary copy.
+            byte_size = input_value.nbytes
+            np.copyto(
+                get_contents_as_numpy(shm_handle, input_value.dtype,
+                                      input_value.shape, offset_current),
+                input_value)
         offset_current += byte_size
     return
 
+def get_contents_as_numpy(shm_handle, datatype, shape, offset=0):
+    """Generates a numpy array using the data stored in the shared
+    memory region with the specified handle. The returned array is a
+    view over the shared memory region, no copy of the data is made, so
+    it reflects any later writes to the region and must not be used
+    after the region is destroyed.
+
+    Parameters
+    ----------
+    shm_handle : c_void_p
+        The handle for the shared memory region.
+    datatype : np.dtype
+        The datatype of the array to be returned. Must be a fixed-size
+        numpy datatype.
+    shape : list
+        The list of int describing the shape of the array to be returned.
+    offset : int
+        The offset, in bytes, into the region where the array begins.
+        The default value is zero.
+
+    Returns
+    -------
+    np.array
+        The numpy array generated using the contents of the specified
+        shared memory region.
+
+    Raises
+    ------
+    SharedMemoryException
+        If the region is too small to hold the requested array.
+    """
+
+    shm_addr = c_void_p()
+    byte_size = c_uint64()
+    _raise_if_error(
+        c_int(_cshm_get_shared_memory_handle_info(shm_handle, byref(shm_addr), \
+            byref(byte_size))))
+
+    datatype = np.dtype(datatype)
+    if datatype.hasobject:
+        _raise_error("datatype must be a fixed-size numpy datatype")
+    count = int(np.prod(shape))
+    if offset + count * datatype.itemsize > byte_size.value:
+        _raise_error("shared memory region is too small for the requested array")
+    if count == 0:
+        return np.empty(shape, dtype=datatype)
+
+    val_buf = (c_byte * byte_size.value).from_address(shm_addr.value)
+    return np.frombuffer(val_buf, dtype=datatype, count=count,
+                         offset=offset).reshape(shape)
+
 def destroy_shared_memory_region(shm_handle):
     """Unlink a shared memory region with the specified handle.
 
@@ -165,7 +242,8 @@ class SharedMemoryException(Exception):
         self.err_code_map = { -2: "unable to get shared memory descriptor",
                             -3: "unable to initialize the size",
                             -4: "unable to read/mmap the shared memory region",
-                            -5: "unable to unlink the shared memory region"}
+                            -5: "unable to unlink the shared memory region",
+                            -6: "not enough space for the shared memory region"}
         self._msg = None
         if type(err) == str:
             self._msg = err
@@ -39,6 +39,9 @@
 
 namespace {
 
+// Regions of at least this size are advised to use huge pages.
+constexpr size_t kHugePageByteSize = 2 * 1024 * 1024;
+
 void*
 SharedMemoryHandleCreate(
     std::string triton_shm_name, void* shm_addr, std::string shm_key,
@@ -54,16 +57,61 @@ SharedMemoryHandleCreate(
   return reinterpret_cast<void*>(handle);
 }
 
+void
+PrefaultRegion(void* addr, size_t byte_size)
+{
+  // The backing space has been reserved by SharedMemoryRegionCreate, so
+  // faulting in the pages can not fail for lack of space.
+#ifdef MADV_POPULATE_WRITE
+  // Faults in the pages writable without touching their contents. Any
+  // failure other than the flag being unsupported (kernels older than
+  // 5.14) leaves the pages to be faulted in on first use.
+  if ((madvise(addr, byte_size, MADV_POPULATE_WRITE) == 0) ||
+      (errno != EINVAL)) {
+    return;
+  }
+#endif  // MADV_POPULATE_WRITE
+
+  // Read every page to map it. Reading, unlike writing, can not race
+  // with another process (e.g. the server) writing into the region.
+  const size_t page_size = sysconf(_SC_PAGESIZE);
+  const volatile char* base = reinterpret_cast<const volatile char*>(addr);
+  for (size_t idx = 0; idx < byte_size; idx += page_size) {
+    (void)base[idx];
+  }
+}
+
 int
 SharedMemoryRegionMap(
     int shm_fd, size_t offset, size_t byte_size, void** shm_addr)
 {
-  // map shared memory to process address space
-  *shm_addr = mmap(NULL, byte_size, PROT_WRITE, MAP_SHARED, shm_fd, offset);
+  // map shared memory to process address space and prefault the pages
+  // so that the first write into the region does not take a page fault
+  // for every page. Large regions benefit from transparent huge pages,
+  // which the kernel only uses for pages faulted in after the hint, so
+  // those are mapped without MAP_POPULATE, advised and then prefaulted.
+  const bool huge = (byte_size >= kHugePageByteSize);
+  int flags = MAP_SHARED;
+#ifdef MAP_POPULATE
+  if (!huge) {
+    flags |= MAP_POPULATE;
+  }
+#endif  // MAP_POPULATE
+  *shm_addr =
+      mmap(NULL, byte_size, PROT_READ | PROT_WRITE, flags, shm_fd, offset);
   if (*shm_addr == MAP_FAILED) {
     return -1;
   }
 
+  if (huge) {
+#ifdef MADV_HUGEPAGE
+    // This is only a hint, so failure (e.g. THP disabled for shmem) is
+    // not an error.
+    madvise(*shm_addr, byte_size, MADV_HUGEPAGE);
+#endif  // MADV_HUGEPAGE
+    PrefaultRegion(*shm_addr, byte_size);
+  }
+
   // close shared memory descriptor, return 0 if success else return -1
   return close(shm_fd);
 }
@@ -76,7 +124,8 @@ SharedMemoryRegionCreate(
     void** shm_handle)
 {
   // get shared memory region descriptor
-  int shm_fd = shm_open(shm_key, O_RDWR | O_CREAT, S_IRUSR | S_IWUSR);
+  int shm_fd =
+      shm_open(shm_key, O_RDWR | O_CREAT | O_CLOEXEC, S_IRUSR | S_IWUSR);
   if (shm_fd == -1) {
     return -2;
   }
@@ -87,6 +136,13 @@ SharedMemoryRegionCreate(
     return -3;
   }
 
+  // reserve the backing space so that running out of it (e.g. a small
+  // /dev/shm) is reported here instead of as SIGBUS on first access
+  if (posix_fallocate(shm_fd, 0, byte_size) == ENOSPC) {
+    close(shm_fd);
+    return -6;
+  }
+
   // get base address of shared memory region
   void* shm_addr = nullptr;
   int err = SharedMemoryRegionMap(shm_fd, 0, byte_size, &shm_addr);
@@ -112,6 +168,16 @@ SharedMemoryRegionSet(
   return 0;
 }
 
+int
+GetSharedMemoryHandleInfo(void* shm_handle, char** shm_addr, size_t* byte_size)
+{
+  SharedMemoryHandle* handle =
+      reinterpret_cast<SharedMemoryHandle*>(shm_handle);
+  *shm_addr = reinterpret_cast<char*>(handle->base_addr_);
+  *byte_size = handle->byte_size_;
+  return 0;
+}
+
 int
 SharedMemoryRegionDestroy(void* shm_handle)
 {
@@ -41,6 +41,8 @@ int SharedMemoryRegionCreate(
     void** shm_handle);
 int SharedMemoryRegionSet(
     void* shm_handle, size_t offset, size_t byte_size, const void* data);
+int GetSharedMemoryHandleInfo(
+    void* shm_handle, char** shm_addr, size_t* byte_size);
 int SharedMemoryRegionDestroy(void* shm_handle);
 
 //==============================================================================
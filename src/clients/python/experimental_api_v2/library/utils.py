@@ -103,65 +103,40 @@ class InferenceServerException(Exception):
         return self._debug_details
 
 
+_TRITON_TO_NP_DTYPE = {
+    "BOOL": np.bool_,
+    "INT8": np.int8,
+    "INT16": np.int16,
+    "INT32": np.int32,
+    "INT64": np.int64,
+    "UINT8": np.uint8,
+    "UINT16": np.uint16,
+    "UINT32": np.uint32,
+    "UINT64": np.uint64,
+    "FP16": np.float16,
+    "FP32": np.float32,
+    "FP64": np.float64,
+    "BYTES": np.object_
+}
+
+# Keyed by both the numpy scalar types and their np.dtype objects, so
+# lookups of either form are a single dict access. np.dtype equality and
+# hashing treat equivalent dtypes (e.g. 'l' and 'q' for int64) as one
+# key while keeping non-native byte orders distinct.
+# FIXMEPV2 support np.bytes_ or np.str_
+_NP_TO_TRITON_DTYPE = {bool: "BOOL", object: "BYTES"}
+for _triton_dtype, _np_type in _TRITON_TO_NP_DTYPE.items():
+    _NP_TO_TRITON_DTYPE[_np_type] = _triton_dtype
+    _NP_TO_TRITON_DTYPE[np.dtype(_np_type)] = _triton_dtype
+del _triton_dtype, _np_type
+
+
 def np_to_triton_dtype(np_dtype):
-    if np_dtype == np.bool:
-        return "BOOL"
-    elif np_dtype == np.int8:
-        return "INT8"
-    elif np_dtype == np.int16:
-        return "INT16"
-    elif np_dtype == np.int32:
-        return "INT32"
-    elif np_dtype == np.int64:
-        return "INT64"
-    elif np_dtype == np.uint8:
-        return "UINT8"
-    elif np_dtype == np.uint16:
-        return "UINT16"
-    elif np_dtype == np.uint32:
-        return "UINT32"
-    elif np_dtype == np.uint64:
-        return "UINT64"
-    elif np_dtype == np.float16:
-        return "FP16"
-    elif np_dtype == np.float32:
-        return "FP32"
-    elif np_dtype == np.float64:
-        return "FP64"
-    # FIXMEPV2 support np.bytes_ or np.str_
-    elif np_dtype == np.object:
-        return "BYTES"
-    return None
+    return _NP_TO_TRITON_DTYPE.get(np_dtype)
 
 
 def triton_to_np_dtype(dtype):
-    if dtype == "BOOL":
-        return np.bool
-    elif dtype == "INT8":
-        return np.int8
-    elif dtype == "INT16":
-        return np.int16
-    elif dtype == "INT32":
-        return np.int32
-    elif dtype == "INT64":
-        return np.int64
-    elif dtype == "UINT8":
-        return np.uint8
-    elif dtype == "UINT16":
-        return np.uint16
-    elif dtype == "UINT32":
-        return np.uint32
-    elif dtype == "UINT64":
-        return np.uint64
-    elif dtype == "FP16":
-        return np.float16
-    elif dtype == "FP32":
-        return np.float32
-    elif dtype == "FP64":
-        return np.float64
-    elif dtype == "BYTES":
-        return np.object
-    return None
+    return _TRITON_TO_NP_DTYPE.get(dtype)
 
 
 def serialize_byte_tensor(input_tensor):
@@ -192,27 +167,28 @@ def serialize_byte_tensor(input_tensor):
     # If the input is a tensor of string/bytes objects, then must flatten those into
     # a 1-dimensional array containing the 4-byte byte size followed by the
     # actual element bytes. All elements are concatenated together in "C"
-    # order.
-    if (input_tensor.dtype == np.object) or (
+    # order. The elements are encoded first so that the output buffer can
+    # be sized once and filled in place.
+    if (input_tensor.dtype == np.object_) or (
             input_tensor.dtype.type == np.bytes_):
-        flattened = bytes()
-        for obj in np.nditer(input_tensor, flags=["refs_ok"], order='C'):
+        elements = []
+        for obj in input_tensor.flat:
             # If directly passing bytes to BYTES type,
             # don't convert it to str as Python will encode the
             # bytes which may distort the meaning
-            if obj.dtype.type == np.bytes_:
-                if type(obj.item()) == bytes:
-                    s = obj.item()
-                else:
-                    s = bytes(obj)
+            if isinstance(obj, bytes):
+                elements.append(obj)
             else:
-                s = str(obj).encode('utf-8')
-            flattened += struct.pack("<I", len(s))
-            flattened += s
-        flattened_array = np.asarray(flattened)
-        if not flattened_array.flags['C_CONTIGUOUS']:
-            flattened_array = np.ascontiguousarray(flattened_array)
-        return flattened_array
+                elements.append(str(obj).encode('utf-8'))
+        flattened = bytearray(4 * len(elements) +
+                              sum(len(s) for s in elements))
+        offset = 0
+        for s in elements:
+            struct.pack_into("<I", flattened, offset, len(s))
+            offset += 4
+            flattened[offset:offset + len(s)] = s
+            offset += len(s)
+        return np.frombuffer(flattened, dtype=np.uint8)
     else:
         raise_error("cannot serialize bytes tensor: invalid datatype")
     return None